@@ -3,13 +3,14 @@ from http.client import responses
 # UPDATE - Improving url encoding
 from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, HTTPException, Cookie
+from fastapi import APIRouter, Depends, HTTPException, Cookie, Request
 from fastapi.responses import  RedirectResponse
 import requests
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from bson import ObjectId
 from database import users_collection
+from rate_limit import AUTH_BURST, AUTH_REFILL_PER_SEC, check_rate
 
 # UPDATE - dotenv package fix
 import os
@@ -73,8 +74,13 @@ async def google_login():
     google_url = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
     return RedirectResponse(url=google_url)
 
+# NEW - The callback is unauthenticated, so it is throttled per client IP
+async def limit_auth_callback(request: Request):
+    client_ip = request.client.host if request.client else "unknown"
+    await check_rate(f"auth:{client_ip}", AUTH_BURST, AUTH_REFILL_PER_SEC)
+
 # NEW - Updated google/callback endpoint
-@router.get("/google/callback")
+@router.get("/google/callback", dependencies=[Depends(limit_auth_callback)])
 async def google_callback (code: str):
     if not code:
         raise HTTPException(status_code=400, detail="Authorization code not provided.")
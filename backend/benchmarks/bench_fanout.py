@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_fanout.py
+# NEW - Latency of loading the dashboard sequentially vs. with the /dashboard fan-out
+#
+# Runs against the database in MONGO_CLIENT, read-only. Usage (from backend/):
+#   python benchmarks/bench_fanout.py <user_id> [runs]
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from database import users_collection, buckets_collection, goals_collection
+from buckets import get_allocations
+from dashboard import GOAL_SUMMARY_FIELDS
+
+
+async def sequential(user_id: str):
+    # What the browser used to trigger: /auth/me, /buckets/ (one goal query per bucket), /goals/
+    await users_collection.find_one({"_id": ObjectId(user_id)})
+    buckets = await buckets_collection.find({"userId": user_id}).to_list(length=1000)
+    for bucket in buckets:
+        await goals_collection.find({"bucketId": str(bucket["_id"]), "userId": user_id}).to_list(length=1000)
+    await goals_collection.find({"userId": user_id}).to_list(length=1000)
+
+
+async def buckets_gathered(user_id: str):
+    # GET /buckets/ after the change
+    await asyncio.gather(
+        buckets_collection.find({"userId": user_id}).to_list(length=1000),
+        get_allocations(user_id),
+    )
+
+
+async def dashboard(user_id: str):
+    # GET /dashboard/ (a 304 skips even this)
+    await asyncio.gather(
+        users_collection.find_one({"_id": ObjectId(user_id)}),
+        buckets_collection.find({"userId": user_id}, {"contributions": 0}).to_list(length=1000),
+        goals_collection.find({"userId": user_id}, GOAL_SUMMARY_FIELDS).to_list(length=1000),
+    )
+
+
+async def measure(fn, user_id: str, runs: int) -> list:
+    await fn(user_id)  # warm up the connection pool
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn(user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main():
+    if len(sys.argv) < 2:
+        sys.exit("usage: python benchmarks/bench_fanout.py <user_id> [runs]")
+    user_id = sys.argv[1]
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    for name, fn in (("sequential", sequential), ("buckets gathered", buckets_gathered), ("dashboard fan-out", dashboard)):
+        timings = await measure(fn, user_id, runs)
+        print(f"  {name:<18} median {statistics.median(timings):8.2f} ms   p95 {sorted(timings)[int(runs * 0.95) - 1]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
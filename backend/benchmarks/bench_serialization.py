@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_serialization.py
+# NEW - Serialization cost of the goal list payload
+#
+# Usage (from backend/):
+#   python benchmarks/bench_serialization.py [goals] [contributions_per_goal]
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from crud import goalHelper
+from json_response import FastJSONResponse
+from schemas import GoalResponse
+
+
+def make_goal_docs(goal_count: int, contribution_count: int) -> list:
+    start = datetime(2024, 1, 1)
+    docs = []
+    for i in range(goal_count):
+        contributions = [
+            {
+                "id": str(uuid.uuid4()),
+                "amount": 100 + j,
+                "type": "deposit" if j % 3 else "withdrawal",
+                "timestamp": start + timedelta(minutes=j),
+            }
+            for j in range(contribution_count)
+        ]
+        docs.append({
+            "_id": ObjectId(),
+            "bucketId": str(ObjectId()),
+            "name": f"Goal {i}",
+            "description": "Benchmark goal",
+            "category": "savings",
+            "colour": "#22c55e",
+            "targetValue": 10_000_000,
+            "currentValue": 5_000,
+            "completed": False,
+            "userId": "bench-user",
+            "contributions": contributions,
+        })
+    return docs
+
+
+def main():
+    goal_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    contribution_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    payload = [goalHelper(doc) for doc in make_goal_docs(goal_count, contribution_count)]
+    adapter = TypeAdapter(List[GoalResponse])
+
+    cases = {
+        # Old path: response_model=list -> jsonable_encoder + json.dumps
+        "jsonable_encoder + json": lambda: json.dumps(jsonable_encoder(payload)).encode(),
+        # Typed response_model left to FastAPI -> validate + serialize every contribution
+        "pydantic validate + dump": lambda: adapter.dump_json(adapter.validate_python(payload)),
+        # New path: helper dicts rendered directly by FastJSONResponse
+        "FastJSONResponse (orjson)": lambda: FastJSONResponse(payload).body,
+    }
+
+    print(f"{goal_count} goals x {contribution_count} contributions")
+    for name, fn in cases.items():
+        runs = 5
+        best = min(timeit.repeat(fn, number=1, repeat=runs))
+        print(f"  {name:<28} {best * 1000:9.2f} ms  ({len(fn())} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# backend/benchmarks/bench_workers.py
+# NEW - Throughput of the API with 1..N gunicorn workers on the same machine
+#
+# Starts `gunicorn main:app -c gunicorn.conf.py` once per worker count and drives it
+# with a multi-process load generator. Needs the same .env as the API (MONGO_CLIENT).
+# Usage (from backend/):
+#   python benchmarks/bench_workers.py [--max-workers 4] [--path /ping] [--cookie <jwt_token>]
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_until_up(url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/ping").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not come up")
+
+
+async def _drive(url: str, cookies: dict, concurrency: int, duration: float) -> int:
+    done = 0
+    stop_at = time.perf_counter() + duration
+
+    async def loop(client):
+        nonlocal done
+        while time.perf_counter() < stop_at:
+            response = await client.get(url)
+            if response.status_code < 400:
+                done += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(cookies=cookies, limits=limits) as client:
+        await asyncio.gather(*(loop(client) for _ in range(concurrency)))
+    return done
+
+
+def _load_process(args) -> int:
+    return asyncio.run(_drive(*args))
+
+
+def measure(url: str, cookies: dict, processes: int, concurrency: int, duration: float) -> float:
+    with multiprocessing.Pool(processes) as pool:
+        counts = pool.map(_load_process, [(url, cookies, concurrency, duration)] * processes)
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    # CPUs this process may actually run on, which is what the workers will get
+    parser.add_argument("--max-workers", type=int, default=len(os.sched_getaffinity(0)))
+    parser.add_argument("--path", default="/ping")
+    parser.add_argument("--cookie", help="jwt_token cookie for authenticated paths")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--load-processes", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32, help="in-flight requests per load process")
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    cookies = {"jwt_token": args.cookie} if args.cookie else {}
+    worker_counts = sorted({1, *[n for n in (2, 4, 8, 16, 32) if n < args.max_workers], args.max_workers})
+
+    baseline = None
+    for workers in worker_counts:
+        env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(args.port), "RUN_BACKGROUND_JOBS": "false"}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "main:app", "-c", "gunicorn.conf.py", "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        try:
+            wait_until_up(base_url)
+            rps = measure(base_url + args.path, cookies, args.load_processes, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+
+        baseline = baseline or rps
+        print(f"  {workers:>2} workers  {rps:10.0f} req/s  ({rps / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
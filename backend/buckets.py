@@ -1,21 +1,39 @@
 # backend/buckets.py
 # NEW - CRUD Ops for Buckets
-from fastapi import APIRouter, HTTPException, Depends, status
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from auth import get_current_user
-from database import buckets_collection, goals_collection
+from etags import bump_data_version, cache_headers, list_etag, not_modified
+from database import client, buckets_collection, goals_collection
 from bson import ObjectId
+from typing import List
+from json_response import FastJSONResponse
+from schemas import BucketResponse, Contribution
+from compaction import delete_archive, reconstruct_history
 
 router = APIRouter(prefix="/buckets", tags=["buckets"])
 
-async def bucket_helper(bucket) -> dict:
-    bucket_id = str(bucket["_id"])
-
+# NEW - Sums goal allocations per bucket on the server instead of pulling every goal's ledger
+async def get_allocations(user_id: str, bucket_id: str = None) -> dict:
     # CHANGED: Fixed keys to camelCase to match the Goal schema correctly
-    goals_cursor = goals_collection.find({"bucketId": bucket_id, "userId": bucket.get("userId")})
-    goals = await goals_cursor.to_list(length=1000)
+    match = {"userId": user_id}
+    if bucket_id:
+        match["bucketId"] = bucket_id
+
+    cursor = goals_collection.aggregate([
+        {"$match": match},
+        {"$group": {"_id": "$bucketId", "allocated": {"$sum": "$currentValue"}}},
+    ])
+    return {row["_id"]: row["allocated"] async for row in cursor}
+
+# CHANGED: Accepts precomputed allocations so list endpoints don't query once per bucket
+async def bucket_helper(bucket, allocations: dict = None) -> dict:
+    bucket_id = str(bucket["_id"])
+    if allocations is None:
+        allocations = await get_allocations(bucket.get("userId"), bucket_id)
 
     # Financial Biz. Logic - Allocated & Unallocated Funds
-    allocated_funds = sum(goal.get("currentValue", 0) for goal in goals)
+    allocated_funds = allocations.get(bucket_id, 0)
     total_balance = bucket.get("totalBalance", 0)
     unallocated_funds = total_balance - allocated_funds
 
@@ -32,7 +50,7 @@ async def bucket_helper(bucket) -> dict:
 # API Endpoints for Buckets:
 
 # CREATE
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=BucketResponse, status_code=status.HTTP_201_CREATED)
 async def create_bucket(bucket: dict, user=Depends(get_current_user)):
     bucket["userId"] = user["sub"]
     if "totalBalance" not in bucket:
@@ -41,30 +59,54 @@ async def create_bucket(bucket: dict, user=Depends(get_current_user)):
         bucket["contributions"] = []
 
     result = await buckets_collection.insert_one(bucket)
+    await bump_data_version(user["sub"])
     new_bucket = await buckets_collection.find_one({"_id": result.inserted_id})
-    return await bucket_helper(new_bucket)
+    return FastJSONResponse(await bucket_helper(new_bucket), status_code=status.HTTP_201_CREATED)
 
 # GET ALL
-@router.get("/", response_model=list)
-async def get_buckets(user=Depends(get_current_user)):
-    buckets_cursor = buckets_collection.find({"userId": user["sub"]})
-    buckets = await buckets_cursor.to_list(length=1000)
-    # WAIT - To calculate unallocated funds
-    return [await bucket_helper(bucket) for bucket in buckets]
+@router.get("/", response_model=List[BucketResponse])
+async def get_buckets(request: Request, user=Depends(get_current_user)):
+    # NEW - Bucket balances depend on goal allocations too, so any write bumps the shared version
+    etag = await list_etag("buckets", user["sub"])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    # CHANGED: Buckets and allocations are independent reads, so fetch them together
+    buckets, allocations = await asyncio.gather(
+        buckets_collection.find({"userId": user["sub"]}).to_list(length=1000),
+        get_allocations(user["sub"]),
+    )
+    return FastJSONResponse([await bucket_helper(bucket, allocations) for bucket in buckets], headers=cache_headers(etag))
 
 # GET ONE
-@router.get("/{id}", response_model=dict)
+@router.get("/{id}", response_model=BucketResponse)
 async def get_bucket(id: str, user=Depends(get_current_user)):
+    # CHANGED: The allocation query is scoped to the caller, so it can run alongside the ownership lookup
+    bucket, allocations = await asyncio.gather(
+        buckets_collection.find_one({"_id": ObjectId(id)}),
+        get_allocations(user["sub"], id),
+    )
+    if not bucket:
+        raise HTTPException(status_code=404, detail="Bucket not found")
+    if bucket.get("userId") != user["sub"]:
+        raise HTTPException(status_code=403, detail="Not authorized to access this bucket")
+
+    return FastJSONResponse(await bucket_helper(bucket, allocations))
+
+# GET FULL HISTORY (NEW) - Includes contributions compacted into the archive
+@router.get("/{id}/history", response_model=List[Contribution])
+async def get_bucket_history(id: str, user=Depends(get_current_user)):
     bucket = await buckets_collection.find_one({"_id": ObjectId(id)})
     if not bucket:
         raise HTTPException(status_code=404, detail="Bucket not found")
     if bucket.get("userId") != user["sub"]:
         raise HTTPException(status_code=403, detail="Not authorized to access this bucket")
-    
-    return await bucket_helper(bucket)  
+
+    return FastJSONResponse(await reconstruct_history(bucket))
 
 # UPDATE
-@router.put("/{id}", response_model=dict)
+@router.put("/{id}", response_model=BucketResponse)
 async def update_bucket(id: str, data: dict, user=Depends(get_current_user)):
     existing_bucket = await buckets_collection.find_one({"_id": ObjectId(id)})
     if not existing_bucket:
@@ -81,9 +123,10 @@ async def update_bucket(id: str, data: dict, user=Depends(get_current_user)):
 
     if safe_update_data:
         await buckets_collection.update_one({"_id": ObjectId(id)}, {"$set": safe_update_data})
+        await bump_data_version(user["sub"])
 
     updated_bucket = await buckets_collection.find_one({"_id": ObjectId(id)})
-    return await bucket_helper(updated_bucket)
+    return FastJSONResponse(await bucket_helper(updated_bucket))
 
 # DELETE
 @router.delete("/{id}", response_model=dict)
@@ -99,8 +142,13 @@ async def delete_bucket(id: str, user=Depends(get_current_user)):
     if attached_goals_count > 0:
         raise HTTPException(status_code=400, detail="Cannot delete bucket with attached goals. Please reassign or delete goals first.")
     
-    result = await buckets_collection.delete_one({"_id": ObjectId(id)})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Bucket not found")
+    # CHANGED: The bucket's archived ledger goes with it, in the same transaction
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            result = await buckets_collection.delete_one({"_id": ObjectId(id)}, session=session)
+            if result.deleted_count == 0:
+                raise HTTPException(status_code=404, detail="Bucket not found")
+            await delete_archive(id, session=session)
+    await bump_data_version(user["sub"])
     
     return {"message": "Bucket deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,148 @@
+# backend/compaction.py
+# NEW - Ledger compaction: folds old contributions into a checkpoint and archives the raw entries
+import asyncio
+import os
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+import bson
+from bson import Binary
+from database import client, goals_collection, buckets_collection, ledger_archive_collection
+from etags import bump_data_version
+
+COMPACTION_HORIZON_DAYS = int(os.getenv("COMPACTION_HORIZON_DAYS", "90"))
+COMPACTION_MIN_ENTRIES = int(os.getenv("COMPACTION_MIN_ENTRIES", "50"))
+COMPACTION_INTERVAL_SECONDS = int(os.getenv("COMPACTION_INTERVAL_SECONDS", "3600"))
+COMPACTION_BATCH_SIZE = 100
+
+# Effect of each contribution type on the running balance.
+# A checkpoint's amount IS the balance at the point it was taken.
+LEDGER_SIGNS = {
+    "deposit": 1,
+    "transfer_in": 1,
+    "checkpoint": 1,
+    "withdrawal": -1,
+    "transfer_out": -1,
+}
+
+
+def ledger_balance(contributions: list) -> int:
+    return sum(LEDGER_SIGNS.get(entry.get("type"), 0) * entry.get("amount", 0) for entry in contributions)
+
+
+def _compress(entries: list) -> Binary:
+    # BSON keeps the datetimes intact, unlike a JSON round trip
+    return Binary(zlib.compress(bson.encode({"entries": entries}), 6))
+
+
+def _decompress(payload: bytes) -> list:
+    return bson.decode(zlib.decompress(payload))["entries"]
+
+
+def _count_foldable(contributions: list, cutoff: datetime) -> int:
+    # Contributions are appended chronologically, so the foldable ones form a prefix
+    count = 0
+    for entry in contributions:
+        timestamp = entry.get("timestamp")
+        if timestamp is None or timestamp >= cutoff:
+            break
+        count += 1
+    return count
+
+
+async def compact_document(collection, owner_type: str, doc: dict, cutoff: datetime) -> bool:
+    contributions = doc.get("contributions", [])
+    fold_count = _count_foldable(contributions, cutoff)
+    if fold_count < COMPACTION_MIN_ENTRIES:
+        return False
+
+    folded = contributions[:fold_count]
+    # A previous checkpoint is folded into the new one; its raw entries are already archived
+    raw_entries = [entry for entry in folded if entry.get("type") != "checkpoint"]
+    if not raw_entries:
+        return False
+
+    if owner_type == "bucket":
+        # A bucket's opening totalBalance never enters its ledger (only withdrawals do),
+        # so work back from the current balance instead of summing the folded entries
+        balance = doc.get("totalBalance", 0) - ledger_balance(contributions[fold_count:])
+    else:
+        balance = ledger_balance(folded)
+
+    checkpoint = {
+        "id": str(uuid.uuid4()),
+        "amount": balance,
+        "type": "checkpoint",
+        "timestamp": folded[-1]["timestamp"],
+    }
+    archive_doc = {
+        "ownerId": str(doc["_id"]),
+        "ownerType": owner_type,
+        "userId": doc.get("userId"),
+        "fromTimestamp": raw_entries[0]["timestamp"],
+        "toTimestamp": raw_entries[-1]["timestamp"],
+        "count": len(raw_entries),
+        "entries": _compress(raw_entries),
+        "archivedAt": datetime.utcnow(),
+    }
+
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            await ledger_archive_collection.insert_one(archive_doc, session=session)
+            # The $size guard skips documents that received a contribution since we read them
+            result = await collection.update_one(
+                {"_id": doc["_id"], "contributions": {"$size": len(contributions)}},
+                {"$set": {"contributions": [checkpoint] + contributions[fold_count:]}},
+                session=session,
+            )
+            if result.matched_count == 0:
+                await session.abort_transaction()
+                return False
+
+    if doc.get("userId"):
+        await bump_data_version(doc["userId"])
+    return True
+
+
+async def reconstruct_history(doc: dict) -> list:
+    """Full contribution history of a goal or bucket: archived entries followed by the live ones."""
+    history = []
+    archives = ledger_archive_collection.find({"ownerId": str(doc["_id"])}).sort("toTimestamp", 1)
+    async for archive in archives:
+        history.extend(_decompress(archive["entries"]))
+
+    history.extend(entry for entry in doc.get("contributions", []) if entry.get("type") != "checkpoint")
+    return history
+
+
+async def delete_archive(owner_id: str, session=None):
+    """Drops the archived entries of a deleted goal or bucket, which nothing else can reach."""
+    await ledger_archive_collection.delete_many({"ownerId": owner_id}, session=session)
+
+
+async def compact_collection(collection, owner_type: str, query: dict) -> dict:
+    cutoff = datetime.utcnow() - timedelta(days=COMPACTION_HORIZON_DAYS)
+    # Only fetch documents whose first COMPACTION_MIN_ENTRIES contributions are all past the horizon
+    query = {**query, f"contributions.{COMPACTION_MIN_ENTRIES - 1}.timestamp": {"$lt": cutoff}}
+
+    stats = {"compacted": 0, "failed": 0}
+    async for doc in collection.find(query).batch_size(COMPACTION_BATCH_SIZE):
+        # A write conflict with a user's own transaction only skips that document until the next pass
+        try:
+            if await compact_document(collection, owner_type, doc, cutoff):
+                stats["compacted"] += 1
+        except Exception as e:
+            stats["failed"] += 1
+            print(f"LEDGER COMPACTION: {owner_type} {doc['_id']} failed: {e}")
+        # Give request handlers a turn between documents
+        await asyncio.sleep(0)
+    return stats
+
+
+async def run_compaction() -> dict:
+    return {
+        "goals": await compact_collection(goals_collection, "goal", {"completed": True}),
+        "buckets": await compact_collection(buckets_collection, "bucket", {}),
+    }
+
@@ -1,8 +1,14 @@
 # FULL REWRITE - Asynchronous Ops. & Contribution Ledger Logic
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from auth import get_current_user
-from database import goals_collection, buckets_collection # CHANGED: Imported buckets_collection
+from etags import bump_data_version, cache_headers, list_etag, not_modified # NEW - Conditional GET
+from json_response import FastJSONResponse # NEW - Skip the generic response encoding pass
+from schemas import Contribution, GoalResponse
+from compaction import delete_archive, reconstruct_history # NEW - Archived ledger entries
+from database import client, goals_collection, buckets_collection # CHANGED: Imported buckets_collection
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime
 import uuid # CHANGED: Imported uuid for ledger integrity
 
@@ -25,7 +31,7 @@ def goalHelper(goal) -> dict:
     }
 
 
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
 async def createGoal(goal: dict, user=Depends(get_current_user)):
     goal["userId"] = user["sub"]
     if "completed" not in goal:
@@ -36,18 +42,25 @@ async def createGoal(goal: dict, user=Depends(get_current_user)):
         goal["contributions"] = []
 
     result = await goals_collection.insert_one(goal)
+    await bump_data_version(user["sub"])
     newGoal = await goals_collection.find_one({"_id": result.inserted_id})
-    return goalHelper(newGoal)
+    return FastJSONResponse(goalHelper(newGoal), status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/", response_model=list)
-async def getGoals(user=Depends(get_current_user)):
+@router.get("/", response_model=List[GoalResponse])
+async def getGoals(request: Request, user=Depends(get_current_user)):
+    # NEW - Unchanged refreshes are answered from the version counter alone
+    etag = await list_etag("goals", user["sub"])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
     goals_cursor = goals_collection.find({"userId": user["sub"]})
     goals = await goals_cursor.to_list(length=1000)
-    return [goalHelper(goal) for goal in goals]
+    return FastJSONResponse([goalHelper(goal) for goal in goals], headers=cache_headers(etag))
 
 
-@router.get("/{id}", response_model=dict)
+@router.get("/{id}", response_model=GoalResponse)
 async def getGoal(id: str, user=Depends(get_current_user)):
     goal = await goals_collection.find_one({"_id": ObjectId(id)})
     if not goal:
@@ -61,10 +74,28 @@ async def getGoal(id: str, user=Depends(get_current_user)):
             detail="403: You are not authorized to access this goal.",
         )
 
-    return goalHelper(goal)
+    return FastJSONResponse(goalHelper(goal))
+
+
+# NEW - Full ledger, including contributions compacted into the archive
+@router.get("/{id}/history", response_model=List[Contribution])
+async def getGoalHistory(id: str, user=Depends(get_current_user)):
+    goal = await goals_collection.find_one({"_id": ObjectId(id)})
+    if not goal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="404: Goal not found."
+        )
+
+    if goal["userId"] != user["sub"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="403: You are not authorized to access this goal.",
+        )
+
+    return FastJSONResponse(await reconstruct_history(goal))
 
 
-@router.put("/{id}", response_model=dict)
+@router.put("/{id}", response_model=GoalResponse)
 async def updateGoal(id: str, data: dict, user=Depends(get_current_user)):
     existing_goal = await goals_collection.find_one({"_id": ObjectId(id)})
     if not existing_goal:
@@ -78,12 +109,15 @@ async def updateGoal(id: str, data: dict, user=Depends(get_current_user)):
             detail="403: You are not authorized to update this goal.",
         )
 
-    await goals_collection.update_one({"_id": ObjectId(id)}, {"$set": data})
-    updated_goal = await goals_collection.find_one({"_id": ObjectId(id)})
-    return goalHelper(updated_goal)
+    # CHANGED: Write and re-read in one round trip
+    updated_goal = await goals_collection.find_one_and_update(
+        {"_id": ObjectId(id)}, {"$set": data}, return_document=ReturnDocument.AFTER
+    )
+    await bump_data_version(user["sub"])
+    return FastJSONResponse(goalHelper(updated_goal))
 
 
-@router.post("/{id}/contributions", response_model=dict)
+@router.post("/{id}/contributions", response_model=GoalResponse)
 async def addContribution(id: str, payload: dict, user=Depends(get_current_user)):
     existing_goal = await goals_collection.find_one({"_id": ObjectId(id)})
     if not existing_goal:
@@ -132,19 +166,20 @@ async def addContribution(id: str, payload: dict, user=Depends(get_current_user)
         "timestamp": datetime.utcnow(),
     }
 
-    await goals_collection.update_one(
+    updated_goal = await goals_collection.find_one_and_update(
         {"_id": ObjectId(id)},
         {
             "$inc": {"currentValue": increment},
             "$push": {"contributions": contribution_record},
         },
+        return_document=ReturnDocument.AFTER,
     )
+    await bump_data_version(user["sub"])
 
-    updated_goal = await goals_collection.find_one({"_id": ObjectId(id)})
-    return goalHelper(updated_goal)
+    return FastJSONResponse(goalHelper(updated_goal))
 
 
-@router.put("/{id}/complete", response_model=dict)
+@router.put("/{id}/complete", response_model=GoalResponse)
 async def completeGoal(id: str, user=Depends(get_current_user)):
     existing_goal = await goals_collection.find_one({"_id": ObjectId(id)})
     if not existing_goal:
@@ -154,35 +189,46 @@ async def completeGoal(id: str, user=Depends(get_current_user)):
 
     # CHANGED: Safety check to avoid double-deducting if already completed
     if existing_goal.get("completed", False):
-        return goalHelper(existing_goal)
+        return FastJSONResponse(goalHelper(existing_goal))
 
     # CHANGED: Deduct target value from parent bucket
     target_val = existing_goal.get("targetValue", 0)
     bucket_id = existing_goal.get("bucketId")
 
-    if bucket_id:
-        withdrawal_record = {
-            "id": str(uuid.uuid4()),
-            "amount": target_val,
-            "type": "withdrawal",
-            "timestamp": datetime.utcnow(),
-            "referenceId": id # Notes that this withdrawal happened because the goal finished
-        }
-        await buckets_collection.update_one(
-            {"_id": ObjectId(bucket_id)},
-            {
-                "$inc": {"totalBalance": -target_val},
-                "$push": {"contributions": withdrawal_record}
-            }
-        )
-
-    await goals_collection.update_one(
-        {"_id": ObjectId(id)}, 
-        {"$set": {"completed": True}}
-    )
-
-    updated_goal = await goals_collection.find_one({"_id": ObjectId(id)})
-    return goalHelper(updated_goal)
+    # CHANGED: Marking the goal and debiting its bucket commit together. Claiming the goal first
+    # (only while it is still open) means two concurrent completes can't both debit the bucket.
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            updated_goal = await goals_collection.find_one_and_update(
+                {"_id": ObjectId(id), "completed": {"$ne": True}},
+                {"$set": {"completed": True}},
+                return_document=ReturnDocument.AFTER,
+                session=session,
+            )
+            if not updated_goal:
+                # Completed by a concurrent request in the meantime
+                completed_goal = await goals_collection.find_one({"_id": ObjectId(id)}, session=session)
+                return FastJSONResponse(goalHelper(completed_goal))
+
+            if bucket_id:
+                withdrawal_record = {
+                    "id": str(uuid.uuid4()),
+                    "amount": target_val,
+                    "type": "withdrawal",
+                    "timestamp": datetime.utcnow(),
+                    "referenceId": id # Notes that this withdrawal happened because the goal finished
+                }
+                await buckets_collection.update_one(
+                    {"_id": ObjectId(bucket_id)},
+                    {
+                        "$inc": {"totalBalance": -target_val},
+                        "$push": {"contributions": withdrawal_record}
+                    },
+                    session=session,
+                )
+
+    await bump_data_version(user["sub"])
+    return FastJSONResponse(goalHelper(updated_goal))
 
 @router.delete("/{id}", response_model=dict)
 async def deleteGoal(id: str, user=Depends(get_current_user)):
@@ -197,9 +243,14 @@ async def deleteGoal(id: str, user=Depends(get_current_user)):
             detail="You are not authorized to delete this goal.",
         )
 
-    result = await goals_collection.delete_one({"_id": ObjectId(id)})
-    if result.deleted_count == 0:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found."
-        )
+    # CHANGED: The goal's archived ledger goes with it, in the same transaction
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            result = await goals_collection.delete_one({"_id": ObjectId(id)}, session=session)
+            if result.deleted_count == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found."
+                )
+            await delete_archive(id, session=session)
+    await bump_data_version(user["sub"])
     return {"message": "Goal deleted successfully."}
\ No newline at end of file
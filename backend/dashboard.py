@@ -0,0 +1,74 @@
+# backend/dashboard.py
+# NEW - One round trip for the dashboard: user, buckets (with allocations) and goal summaries, without ledgers
+import asyncio
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, Request
+from auth import get_current_user
+from database import users_collection, buckets_collection, goals_collection
+from bson import ObjectId
+from buckets import bucket_helper
+from etags import cache_headers, list_etag, not_modified
+from json_response import FastJSONResponse
+from schemas import DashboardResponse
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+# Goal summaries leave the ledger behind, which is most of a goal's size; a goal's chart
+# fetches its ledger from /goals/{id} when it is opened
+GOAL_SUMMARY_FIELDS = {
+    "bucketId": 1,
+    "name": 1,
+    "description": 1,
+    "category": 1,
+    "colour": 1,
+    "targetValue": 1,
+    "currentValue": 1,
+    "completed": 1,
+}
+
+
+def goal_summary_helper(goal) -> dict:
+    return {
+        "id": str(goal["_id"]),
+        "bucketId": goal.get("bucketId", ""),
+        "name": goal["name"],
+        "description": goal.get("description", ""),
+        "category": goal["category"],
+        "colour": goal["colour"],
+        "targetValue": goal["targetValue"],
+        "currentValue": goal.get("currentValue", 0),
+        "completed": goal.get("completed", False),
+    }
+
+
+@router.get("/", response_model=DashboardResponse)
+async def get_dashboard(request: Request, user=Depends(get_current_user)):
+    # Read before the data, so a write landing in between can only make the tag older, never newer
+    etag = await list_etag("dashboard", user["sub"])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    # None of these reads depend on each other, so they run concurrently
+    db_user, buckets, goals = await asyncio.gather(
+        users_collection.find_one({"_id": ObjectId(user["sub"])}),
+        buckets_collection.find({"userId": user["sub"]}, {"contributions": 0}).to_list(length=1000),
+        goals_collection.find({"userId": user["sub"]}, GOAL_SUMMARY_FIELDS).to_list(length=1000),
+    )
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Same figures bucket_helper would query for, taken from the summaries already in hand
+    allocations = Counter()
+    for goal in goals:
+        allocations[goal.get("bucketId", "")] += goal.get("currentValue", 0)
+
+    return FastJSONResponse({
+        "user": {
+            "id": str(db_user["_id"]),
+            "email": db_user["email"],
+            "name": db_user.get("name"),
+        },
+        "buckets": [await bucket_helper(bucket, allocations) for bucket in buckets],
+        "goals": [goal_summary_helper(goal) for goal in goals],
+    }, headers=cache_headers(etag))
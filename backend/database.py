@@ -14,8 +14,21 @@ db = client["goal_app"]
 users_collection = db["users"]
 goals_collection = db["goals"]
 buckets_collection = db["buckets"]
+ledger_archive_collection = db["ledger_archive"] # NEW - Compressed contribution history moved out by compaction
+job_reports_collection = db["job_reports"] # NEW - One document per background job pass
+job_locks_collection = db["job_locks"] # NEW - Leases so only one process runs each job pass
+rate_limits_collection = db["rate_limits"] # NEW - Shared limiter state for multi-worker deployments
 
 # NEW - Create compound indexes for better performance
 async def create_indexes():
-    await buckets_collection.create_index("user_id")
-    await goals_collection.create_index([("user_id", 1), ("bucket_id", 1)])
\ No newline at end of file
+    # CHANGED: Documents use camelCase keys (userId / bucketId), so index those
+    # A failed build is logged rather than raised, so startup never depends on it
+    try:
+        await buckets_collection.create_index("userId")
+        await goals_collection.create_index([("userId", 1), ("bucketId", 1)])
+        await ledger_archive_collection.create_index([("ownerId", 1), ("toTimestamp", 1)])
+        await job_reports_collection.create_index([("job", 1), ("startedAt", -1)])
+        await job_reports_collection.create_index("startedAt", expireAfterSeconds=30 * 24 * 3600)
+        await rate_limits_collection.create_index("expiresAt", expireAfterSeconds=0)
+    except Exception as e:
+        print(f"INDEX CREATION ERROR: {e}")
\ No newline at end of file
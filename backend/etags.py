@@ -0,0 +1,44 @@
+# backend/etags.py
+# NEW - Per-user data versions for ETag / conditional GET on the list endpoints
+from bson import ObjectId
+from fastapi import Request, Response, status
+from database import users_collection
+
+
+async def get_data_version(user_id: str) -> int:
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"dataVersion": 1})
+    return user.get("dataVersion", 0) if user else 0
+
+
+async def bump_data_version(user_id: str):
+    """
+    Invalidates every cached list response for this user.
+
+    Call it AFTER the write (or transaction) has committed, so a reader can never
+    pair the new version with the old data.
+    """
+    await users_collection.update_one({"_id": ObjectId(user_id)}, {"$inc": {"dataVersion": 1}})
+
+
+async def list_etag(scope: str, user_id: str) -> str:
+    # Weak tag: the compression middleware may re-encode the body
+    version = await get_data_version(user_id)
+    return f'W/"{scope}-{user_id}-{version}"'
+
+
+def cache_headers(etag: str) -> dict:
+    # no-cache = the browser may keep the body but must revalidate it with us first
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, etag: str):
+    """Returns a 304 response if the client already holds this version, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    # If-None-Match uses weak comparison, so the W/ prefix is ignored on both sides
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+    return None
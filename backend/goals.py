@@ -1,6 +1,6 @@
 # FULL REWRITE - Async. Updates:
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from schemas import Goal, GoalUpdate, ContributionRequest
 from crud import createGoal, getGoal, getGoals, updateGoal, deleteGoal, addContribution
 from auth import get_current_user
@@ -14,8 +14,8 @@ async def add_goal(goal: Goal, user=Depends(get_current_user)):
 
 
 @router.get("/", response_model=List[Goal])
-async def read_goals(user=Depends(get_current_user)):
-    return await getGoals(user)
+async def read_goals(request: Request, user=Depends(get_current_user)):
+    return await getGoals(request, user)
 
 
 @router.get("/{id}", response_model=Goal)
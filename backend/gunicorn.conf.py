@@ -0,0 +1,29 @@
+# backend/gunicorn.conf.py
+# NEW - Multi-worker deployment: gunicorn managing uvicorn workers
+# Usage: gunicorn main:app -c gunicorn.conf.py
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+# One worker unless WEB_CONCURRENCY says otherwise. cpu_count() reports the host's cores, not the
+# container's CPU quota, so raise it explicitly to what the deployment is actually allotted.
+workers = int(os.getenv("WEB_CONCURRENCY") or 1)
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Each worker imports the app (and opens its own Motor client) after the fork;
+# a client created in the master process is not fork-safe.
+preload_app = False
+
+graceful_timeout = 30
+keepalive = 5
+
+# Proxies whose X-Forwarded-For is trusted for the client IP (the OAuth callback is rate limited
+# per IP). Behind a hosting load balancer set FORWARDED_ALLOW_IPS to its address(es), or "*" when
+# the API is only reachable through that proxy; with the default every login shares the proxy's IP.
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def on_starting(server):
+    # server.cfg has the final worker count (a CLI -w overrides the value above). The workers inherit
+    # this, so rate_limit.py refuses the per-process limiter with more than one of them.
+    # Background jobs need no switch: job_locks leases keep each pass to a single worker.
+    os.environ["WEB_CONCURRENCY"] = str(server.cfg.workers)
@@ -0,0 +1,128 @@
+# backend/jobs.py
+# NEW - In-process asyncio scheduler for periodic maintenance work
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+from database import job_locks_collection, job_reports_collection
+from compaction import COMPACTION_INTERVAL_SECONDS, run_compaction
+from reconciliation import RECONCILE_INTERVAL_SECONDS, run_reconciliation
+
+# A running pass renews its lease well within this; a crashed one frees the job once it runs out
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+
+class Job:
+    def __init__(self, name: str, interval_seconds: float, func):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func  # async callable returning a JSON-friendly dict of results
+
+
+class JobScheduler:
+    """
+    Runs each registered job on its own interval, one pass at a time.
+
+    Every pass is timed and written to job_reports, so passes run by the API
+    process and by the standalone worker (worker.py) land in the same place.
+    Passes are claimed through a lease in job_locks, so with several API workers
+    (or containers) each job still runs once per interval across all of them.
+    The lease is renewed for as long as the pass runs and, when it ends, held
+    until the interval is up, so a pass that overruns never overlaps the next one.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.tasks = []
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def add(self, name: str, interval_seconds: float, func):
+        self.jobs.append(Job(name, interval_seconds, func))
+
+    def start(self):
+        for job in self.jobs:
+            self.tasks.append(asyncio.create_task(self._run_forever(job)))
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def claim(self, job: Job) -> bool:
+        now = datetime.utcnow()
+        try:
+            # Once the lease is held and unexpired the filter misses and the upsert hits the existing _id
+            await job_locks_collection.update_one(
+                {"_id": job.name, "lockedUntil": {"$lte": now}},
+                {"$set": {"lockedUntil": now + timedelta(seconds=JOB_LEASE_SECONDS), "owner": self.owner}},
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def _hold(self, job: Job, until: datetime):
+        # Only moves a lease this process still owns
+        await job_locks_collection.update_one(
+            {"_id": job.name, "owner": self.owner},
+            {"$set": {"lockedUntil": until}},
+        )
+
+    async def _renew_lease(self, job: Job):
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                await self._hold(job, datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS))
+            except Exception as e:
+                print(f"JOB {job.name}: could not renew lease: {e}")
+
+    async def run_once(self, job: Job):
+        if not await self.claim(job):
+            return None
+
+        report = {"job": job.name, "owner": self.owner, "startedAt": datetime.utcnow()}
+        started = time.perf_counter()
+        renewal = asyncio.create_task(self._renew_lease(job))
+        try:
+            report["result"] = await job.func()
+            report["status"] = "ok"
+        except Exception as e:
+            report["status"] = "error"
+            report["error"] = str(e)
+        finally:
+            renewal.cancel()
+            await asyncio.gather(renewal, return_exceptions=True)
+        report["durationMs"] = round((time.perf_counter() - started) * 1000, 1)
+
+        # Hold the job for max(interval, pass duration) from the start of this pass
+        next_pass = report["startedAt"] + timedelta(seconds=job.interval_seconds)
+        try:
+            await self._hold(job, max(next_pass, datetime.utcnow()))
+        except Exception as e:
+            print(f"JOB {job.name}: could not release lease: {e}")
+
+        print(f"JOB {job.name}: {report['status']} in {report['durationMs']} ms")
+        try:
+            await job_reports_collection.insert_one(report)
+        except Exception as e:
+            print(f"JOB {job.name}: could not store report: {e}")
+        return report
+
+    async def _run_forever(self, job: Job):
+        while True:
+            try:
+                await self.run_once(job)
+            except Exception as e:
+                print(f"JOB {job.name}: could not claim a pass: {e}")
+            await asyncio.sleep(job.interval_seconds)
+
+
+def build_scheduler() -> JobScheduler:
+    scheduler = JobScheduler()
+    scheduler.add("ledger_compaction", COMPACTION_INTERVAL_SECONDS, run_compaction)
+    scheduler.add("ledger_reconciliation", RECONCILE_INTERVAL_SECONDS, run_reconciliation)
+    return scheduler
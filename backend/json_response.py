@@ -0,0 +1,27 @@
+# backend/json_response.py
+# NEW - orjson-backed responses for the ledger-heavy routes
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+
+
+def _default(obj: Any):
+    # Mongo documents can still carry ObjectIds inside raw contribution records
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    Serializes helper dicts straight to bytes with orjson.
+
+    Routes return this directly so FastAPI skips validating the payload against
+    the declared response_model and re-encoding every contribution's datetime.
+    The response_model is still declared on each route for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,16 +1,23 @@
+import asyncio
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from brotli_asgi import BrotliMiddleware
+from json_response import FastJSONResponse
 
 # Routers
 from auth import router as auth_router
 from crud import router as goals_router
 from buckets import router as buckets_router
 from transactions import router as transactions_router
+from dashboard import router as dashboard_router
+
+from database import create_indexes
+from jobs import build_scheduler
 
 import os
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
@@ -27,12 +34,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# NEW - Brotli for clients that accept it, gzip otherwise; small bodies are sent as-is
+app.add_middleware(BrotliMiddleware, minimum_size=1000, gzip_fallback=True)
+
 app.include_router(auth_router)
 app.include_router(buckets_router)
 app.include_router(goals_router)
 app.include_router(transactions_router)
+app.include_router(dashboard_router)
+
+# NEW - Maintenance jobs run inside the API process unless RUN_BACKGROUND_JOBS=false
+# (set that when the standalone worker.py is deployed instead)
+@app.on_event("startup")
+async def start_background_jobs():
+    # Built in the background so an unreachable cluster doesn't hold up startup
+    app.state.index_task = asyncio.create_task(create_indexes())
+    if os.getenv("RUN_BACKGROUND_JOBS", "true").lower() == "true":
+        app.state.scheduler = build_scheduler()
+        app.state.scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    if getattr(app.state, "scheduler", None):
+        await app.state.scheduler.stop()
 
 @app.get("/")
 def read_root():
@@ -43,5 +70,15 @@ async def ping_server():
     return {"status": "awake", "message": "Goalie backend is active!"}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # NEW - `python main.py` can also run several workers (WEB_CONCURRENCY), without gunicorn's supervision.
+    # Plain `uvicorn main:app --workers N` works too but doesn't tell the app its worker count, so keep
+    # the default shared rate limiter (RATE_LIMIT_BACKEND=mongo) there.
+    # FORWARDED_ALLOW_IPS: see gunicorn.conf.py
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+    )
 
@@ -0,0 +1,184 @@
+# backend/rate_limit.py
+# NEW - Token-bucket rate limiting and per-user in-flight limits
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from database import rate_limits_collection
+
+# Worker processes serving the API when it is known: `python main.py` reads it and gunicorn.conf.py
+# exports the final count (CLI -w included). `uvicorn main:app --workers N` never sets it.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY") or "1")
+
+# "mongo" (shared by every worker) or "memory" (per process). Per-process state would let each
+# worker grant its own quota, and a worker can't always tell how many siblings it has (see above),
+# so Mongo is the default and "memory" has to be asked for, for a single process only.
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND") or "mongo"
+if RATE_LIMIT_BACKEND == "memory" and WEB_CONCURRENCY > 1:
+    raise RuntimeError(
+        f"RATE_LIMIT_BACKEND=memory cannot enforce limits across {WEB_CONCURRENCY} workers; use mongo"
+    )
+
+
+def _positive_setting(name: str, default: str, cast):
+    # Refill rates are divisors in the limiter math, so zero or negative values are refused at startup
+    value = cast(os.getenv(name, default))
+    if value <= 0:
+        raise ValueError(f"{name} must be greater than zero, got {value}")
+    return value
+
+
+# Transactional routes (per user)
+TX_BURST = _positive_setting("RATE_LIMIT_TX_BURST", "10", int)
+TX_REFILL_PER_SEC = _positive_setting("RATE_LIMIT_TX_REFILL_PER_SEC", "2", float)
+TX_MAX_IN_FLIGHT = _positive_setting("RATE_LIMIT_TX_MAX_IN_FLIGHT", "2", int)
+
+# OAuth callback (per client IP, unauthenticated). The client IP is only right behind a
+# proxy listed in FORWARDED_ALLOW_IPS; otherwise every login counts against the proxy's IP.
+AUTH_BURST = _positive_setting("RATE_LIMIT_AUTH_BURST", "10", int)
+AUTH_REFILL_PER_SEC = _positive_setting("RATE_LIMIT_AUTH_REFILL_PER_SEC", "0.2", float)
+
+
+class InMemoryBackend:
+    """
+    Process-local limiter state.
+
+    Every method is a coroutine so a shared store (one that has to do I/O) can be
+    dropped in with set_backend() without touching the dependencies below.
+    """
+
+    # Idle buckets are pruned once the table grows past this many keys
+    MAX_KEYS = 10_000
+
+    def __init__(self):
+        self.buckets = {}  # key -> (tokens, last_refill, seconds_to_refill_completely)
+        self.in_flight = {}  # key -> active request count
+
+    async def take(self, key: str, burst: int, refill_per_sec: float) -> float:
+        """Takes one token. Returns 0 if allowed, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        tokens, last, _ = self.buckets.get(key, (burst, now, 0))
+        tokens = min(burst, tokens + (now - last) * refill_per_sec)
+        full_after = burst / refill_per_sec
+
+        if tokens >= 1:
+            self.buckets[key] = (tokens - 1, now, full_after)
+            if len(self.buckets) > self.MAX_KEYS:
+                self._prune(now)
+            return 0
+
+        self.buckets[key] = (tokens, now, full_after)
+        return (1 - tokens) / refill_per_sec
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        active = self.in_flight.get(key, 0)
+        if active >= limit:
+            return False
+        self.in_flight[key] = active + 1
+        return True
+
+    async def release(self, key: str):
+        active = self.in_flight.get(key, 0) - 1
+        if active > 0:
+            self.in_flight[key] = active
+        else:
+            self.in_flight.pop(key, None)
+
+    def _prune(self, now: float):
+        # A bucket that has been idle long enough to refill completely carries no state
+        self.buckets = {
+            key: entry
+            for key, entry in self.buckets.items()
+            if now - entry[1] < entry[2]
+        }
+
+
+class MongoBackend:
+    """
+    Limiter state shared by every worker process through the rate_limits collection.
+
+    Each check is a single atomic round trip; documents expire through the TTL
+    index on expiresAt once they would have refilled completely anyway.
+    """
+
+    # Slot counters left behind by a crashed worker disappear after this long without traffic
+    IN_FLIGHT_TTL_SECONDS = 60
+
+    async def take(self, key: str, burst: int, refill_per_sec: float) -> float:
+        now = time.time()
+        elapsed = {"$max": [0, {"$subtract": [now, {"$ifNull": ["$refilledAt", now]}]}]}
+        bucket = await rate_limits_collection.find_one_and_update(
+            {"_id": f"bucket:{key}"},
+            [
+                {"$set": {
+                    "tokens": {"$min": [burst, {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed, refill_per_sec]}]}]},
+                    "refilledAt": now,
+                    "expiresAt": datetime.utcnow() + timedelta(seconds=burst / refill_per_sec),
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if bucket["allowed"]:
+            return 0
+        return (1 - bucket["tokens"]) / refill_per_sec
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        try:
+            # At the limit the filter misses, the upsert collides with the existing _id, and we refuse
+            await rate_limits_collection.update_one(
+                {"_id": f"slots:{key}", "count": {"$lt": limit}},
+                {
+                    "$inc": {"count": 1},
+                    "$set": {"expiresAt": datetime.utcnow() + timedelta(seconds=self.IN_FLIGHT_TTL_SECONDS)},
+                },
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def release(self, key: str):
+        await rate_limits_collection.update_one(
+            {"_id": f"slots:{key}", "count": {"$gt": 0}},
+            {"$inc": {"count": -1}},
+        )
+
+
+backend = MongoBackend() if RATE_LIMIT_BACKEND == "mongo" else InMemoryBackend()
+
+
+def set_backend(new_backend):
+    global backend
+    backend = new_backend
+
+
+def too_many_requests(retry_after: float):
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests. Please slow down.",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def check_rate(key: str, burst: int, refill_per_sec: float):
+    retry_after = await backend.take(key, burst, refill_per_sec)
+    if retry_after:
+        raise too_many_requests(retry_after)
+
+
+@asynccontextmanager
+async def in_flight_slot(key: str, limit: int):
+    if not await backend.acquire(key, limit):
+        raise too_many_requests(1)
+    try:
+        yield
+    finally:
+        await backend.release(key)
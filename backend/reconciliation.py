@@ -0,0 +1,135 @@
+# backend/reconciliation.py
+# NEW - Ledger integrity scans run by the job scheduler
+import asyncio
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+from pymongo import ReadPreference
+from database import goals_collection, buckets_collection
+from compaction import ledger_balance
+
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("RECONCILE_INTERVAL_SECONDS", "21600"))
+RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", "200"))
+# Pause between batches so a scan never hogs the event loop or the cluster
+RECONCILE_BATCH_PAUSE_SECONDS = float(os.getenv("RECONCILE_BATCH_PAUSE_SECONDS", "0.05"))
+# The scan reads goals one by one without a snapshot, so a transfer committed mid-scan can show
+# one leg and not the other; legs younger than this (counted from the scan's start) wait for the next pass
+RECONCILE_SETTLE_SECONDS = int(os.getenv("RECONCILE_SETTLE_SECONDS", "300"))
+# Only the first findings of each kind are stored in the report; the counts are always exact
+MAX_REPORTED_FINDINGS = 100
+
+
+class Findings:
+    def __init__(self):
+        self.counts = Counter()
+        self.samples = []
+
+    def add(self, kind: str, **details):
+        self.counts[kind] += 1
+        if self.counts[kind] <= MAX_REPORTED_FINDINGS:
+            self.samples.append({"kind": kind, **details})
+
+
+async def _scan(collection, projection: dict):
+    """Yields documents in throttled batches, preferring a secondary so the primary keeps serving requests."""
+    collection = collection.with_options(read_preference=ReadPreference.SECONDARY_PREFERRED)
+    seen = 0
+    async for doc in collection.find({}, projection).batch_size(RECONCILE_BATCH_SIZE):
+        yield doc
+        seen += 1
+        if seen % RECONCILE_BATCH_SIZE == 0:
+            await asyncio.sleep(RECONCILE_BATCH_PAUSE_SECONDS)
+
+
+def _checkpoint_time(contributions: list):
+    for entry in contributions:
+        if entry.get("type") == "checkpoint":
+            return entry.get("timestamp")
+    return None
+
+
+async def run_reconciliation() -> dict:
+    findings = Findings()
+    scanned = Counter()
+    settled_before = datetime.utcnow() - timedelta(seconds=RECONCILE_SETTLE_SECONDS)
+
+    # Goals: currentValue must equal the ledger; collect transfer legs for pairing
+    transfers_out = Counter()  # (sourceId, targetId, amount, timestamp)
+    transfers_in = Counter()
+    compacted_until = {}  # goal id -> timestamp of its checkpoint
+    goal_ids = set()
+    allocated_by_bucket = Counter()
+
+    async for goal in _scan(goals_collection, {"bucketId": 1, "currentValue": 1, "completed": 1, "contributions": 1}):
+        scanned["goals"] += 1
+        goal_id = str(goal["_id"])
+        goal_ids.add(goal_id)
+        contributions = goal.get("contributions", [])
+
+        expected = ledger_balance(contributions)
+        if goal.get("currentValue", 0) != expected:
+            findings.add("goal_balance_mismatch", goalId=goal_id, currentValue=goal.get("currentValue", 0), ledger=expected)
+
+        checkpoint_time = _checkpoint_time(contributions)
+        if checkpoint_time:
+            compacted_until[goal_id] = checkpoint_time
+
+        for entry in contributions:
+            if entry.get("type") not in ("transfer_out", "transfer_in"):
+                continue
+            if entry.get("timestamp") and entry["timestamp"] >= settled_before:
+                scanned["unsettledTransferLegs"] += 1
+                continue
+            if entry["type"] == "transfer_out":
+                transfers_out[(goal_id, entry.get("referenceId"), entry.get("amount"), entry.get("timestamp"))] += 1
+            else:
+                transfers_in[(entry.get("referenceId"), goal_id, entry.get("amount"), entry.get("timestamp"))] += 1
+
+        # Same definition as get_allocations / get_unallocated_balance: every goal in the bucket counts
+        if goal.get("bucketId"):
+            allocated_by_bucket[goal["bucketId"]] += goal.get("currentValue", 0)
+
+    # Transfers: every transfer_out needs its transfer_in twin, and vice versa
+    for leg, missing_side, counterpart_index, legs, twins in (
+        ("transfer_out", "transfer_in", 1, transfers_out, transfers_in),
+        ("transfer_in", "transfer_out", 0, transfers_in, transfers_out),
+    ):
+        for key, count in (legs - twins).items():
+            counterpart = key[counterpart_index]
+            details = dict(leg=leg, sourceId=key[0], targetId=key[1], amount=key[2], timestamp=key[3], count=count)
+            if counterpart not in goal_ids:
+                # The other goal was deleted and its leg with it; nothing is left to pair or repair
+                findings.add("orphaned_transfer", **details)
+                continue
+            # The twin may simply have been compacted into the counterpart's checkpoint
+            if counterpart in compacted_until and key[3] and key[3] <= compacted_until[counterpart]:
+                continue
+            findings.add("unmatched_transfer", missing=missing_side, **details)
+    scanned["transfers"] = sum(transfers_out.values())
+
+    # Buckets: the opening totalBalance is never written to the ledger, so the ledger can only be
+    # checked against totalBalance once compaction has anchored it with a checkpoint
+    async for bucket in _scan(buckets_collection, {"totalBalance": 1, "contributions": 1}):
+        scanned["buckets"] += 1
+        bucket_id = str(bucket["_id"])
+        total_balance = bucket.get("totalBalance", 0)
+        allocated = allocated_by_bucket.get(bucket_id, 0)
+        contributions = bucket.get("contributions", [])
+
+        if total_balance < 0:
+            findings.add("bucket_negative_balance", bucketId=bucket_id, totalBalance=total_balance)
+        if allocated > total_balance:
+            # The UI shows this bucket with negative unallocated funds
+            findings.add("bucket_over_allocated", bucketId=bucket_id, totalBalance=total_balance, allocated=allocated)
+        if _checkpoint_time(contributions):
+            scanned["bucketsWithCheckpoint"] += 1
+            expected = ledger_balance(contributions)
+            if total_balance != expected:
+                findings.add("bucket_balance_mismatch", bucketId=bucket_id, totalBalance=total_balance, ledger=expected)
+
+    return {
+        "scanned": dict(scanned),
+        "findingCounts": dict(findings.counts),
+        "findings": findings.samples,
+    }
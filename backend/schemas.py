@@ -8,8 +8,9 @@ from datetime import datetime
 
 # NEW - The ledger system to track changes to goals
 class Contribution(BaseModel):
+    id: Optional[str] = None
     amount: int
-    type: str  # 'deposit', 'withdrawal', 'transfer_in', or 'transfer_out'
+    type: str  # 'deposit', 'withdrawal', 'transfer_in', 'transfer_out', or 'checkpoint' (compacted balance)
     referenceId: Optional[str] = None # CHANGED: Added to link double-entry transfers
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
@@ -22,6 +23,10 @@ class Bucket(BaseModel):
     totalBalance: int = 0
     contributions: List[Contribution] = []
 
+# NEW - Shape returned by bucket_helper (adds the derived unallocated funds)
+class BucketResponse(Bucket):
+    unallocatedFunds: int = 0
+
 # UPDATE - Link to Bucket
 class Goal(BaseModel):
     id: Optional[str] = None  # Updated to str because Mongo uses a str ID
@@ -35,6 +40,23 @@ class Goal(BaseModel):
     completed: bool = False
     contributions: List[Contribution] = []
 
+# NEW - Shape returned by goalHelper (adds the owning user)
+class GoalResponse(Goal):
+    userId: str
+
+
+# NEW - Goal without its ledger, for the dashboard overview
+class GoalSummary(BaseModel):
+    id: str
+    bucketId: str = ""
+    name: str
+    description: str = ""
+    category: str
+    colour: str
+    targetValue: int
+    currentValue: int = 0
+    completed: bool = False
+
 
 # UPDATE - No longer includes currentValue, as it's now a derivative from contributions
 class GoalUpdate(BaseModel):
@@ -62,4 +84,17 @@ class User(BaseModel):
     id: Optional[str]
     email: str
     name: Optional[str]
-    google_id: str
\ No newline at end of file
+    google_id: str
+
+
+# NEW - Everything the dashboard needs in one response
+class UserProfile(BaseModel):
+    id: str
+    email: str
+    name: Optional[str] = None
+
+
+class DashboardResponse(BaseModel):
+    user: UserProfile
+    buckets: List[BucketResponse]
+    goals: List[GoalSummary]
\ No newline at end of file
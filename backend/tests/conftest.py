@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+# The backend modules are imported flat (as in the Dockerfile), so put backend/ on the path
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
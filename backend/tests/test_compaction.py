@@ -0,0 +1,163 @@
+# backend/tests/test_compaction.py
+# Compaction rewrites ledgers permanently, so these check that nothing is lost on the way
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+import mongomock
+
+import buckets
+import compaction
+import crud
+
+OLD = datetime(2020, 1, 1)
+RECENT = datetime.utcnow().replace(microsecond=0)
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession(FakeTransaction):
+    def start_transaction(self):
+        return FakeTransaction()
+
+    async def abort_transaction(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # mongomock has no transactions; the session is accepted and ignored
+    mongomock.ignore_feature("session")
+    client = mongomock_motor.AsyncMongoMockClient()
+    database = client["goal_app"]
+
+    async def start_session():
+        return FakeSession()
+
+    async def bump_data_version(user_id):
+        pass
+
+    monkeypatch.setattr(compaction, "goals_collection", database["goals"])
+    monkeypatch.setattr(compaction, "buckets_collection", database["buckets"])
+    monkeypatch.setattr(compaction, "ledger_archive_collection", database["ledger_archive"])
+    monkeypatch.setattr(compaction.client, "start_session", start_session)
+    monkeypatch.setattr(compaction, "bump_data_version", bump_data_version)
+    monkeypatch.setattr(crud, "goals_collection", database["goals"])
+    monkeypatch.setattr(crud, "bump_data_version", bump_data_version)
+    monkeypatch.setattr(buckets, "buckets_collection", database["buckets"])
+    monkeypatch.setattr(buckets, "goals_collection", database["goals"])
+    monkeypatch.setattr(buckets, "bump_data_version", bump_data_version)
+    monkeypatch.setattr(compaction, "COMPACTION_MIN_ENTRIES", 50)
+    return database
+
+
+def _entries(count: int, start: datetime, types: list) -> list:
+    return [
+        {"id": f"c{start.year}-{i}", "amount": 10 + i, "type": types[i % len(types)], "timestamp": start + timedelta(hours=i)}
+        for i in range(count)
+    ]
+
+
+def test_goal_round_trip(db):
+    async def scenario():
+        contributions = _entries(60, OLD, ["deposit", "deposit", "withdrawal", "transfer_in", "transfer_out"])
+        contributions += _entries(3, RECENT, ["deposit"])
+        balance = compaction.ledger_balance(contributions)
+        await db["goals"].insert_one({"_id": "g1", "userId": "u1", "completed": True, "currentValue": balance, "contributions": contributions})
+
+        stats = await compaction.run_compaction()
+        goal = await db["goals"].find_one({"_id": "g1"})
+
+        assert stats["goals"] == {"compacted": 1, "failed": 0}
+        assert goal["contributions"][0]["type"] == "checkpoint"
+        assert goal["contributions"][0]["amount"] == compaction.ledger_balance(contributions[:60])
+        assert len(goal["contributions"]) == 4
+        assert compaction.ledger_balance(goal["contributions"]) == goal["currentValue"]
+        assert await compaction.reconstruct_history(goal) == contributions
+
+    asyncio.run(scenario())
+
+
+def test_bucket_checkpoint_holds_balance(db):
+    async def scenario():
+        # The opening balance is not in a bucket's ledger, only the withdrawals are
+        contributions = _entries(55, OLD, ["withdrawal"]) + _entries(2, RECENT, ["withdrawal"])
+        await db["buckets"].insert_one({"_id": "b1", "userId": "u1", "totalBalance": 835, "contributions": contributions})
+
+        await compaction.run_compaction()
+        bucket = await db["buckets"].find_one({"_id": "b1"})
+
+        assert bucket["contributions"][0]["type"] == "checkpoint"
+        assert compaction.ledger_balance(bucket["contributions"]) == 835
+        assert await compaction.reconstruct_history(bucket) == contributions
+
+    asyncio.run(scenario())
+
+
+def test_recompaction_keeps_full_history(db, monkeypatch):
+    async def scenario():
+        contributions = _entries(60, OLD, ["deposit", "withdrawal", "deposit"])
+        await db["goals"].insert_one({"_id": "g1", "userId": "u1", "completed": True, "currentValue": compaction.ledger_balance(contributions), "contributions": contributions})
+        await compaction.run_compaction()
+
+        later = _entries(60, OLD + timedelta(days=30), ["deposit"])
+        await db["goals"].update_one({"_id": "g1"}, {"$push": {"contributions": {"$each": later}}, "$inc": {"currentValue": compaction.ledger_balance(later)}})
+        await compaction.run_compaction()
+        goal = await db["goals"].find_one({"_id": "g1"})
+
+        assert [entry["type"] for entry in goal["contributions"]] == ["checkpoint"]
+        assert goal["contributions"][0]["amount"] == goal["currentValue"]
+        assert await compaction.reconstruct_history(goal) == contributions + later
+
+    asyncio.run(scenario())
+
+
+def test_failed_document_does_not_stop_the_pass(db, monkeypatch):
+    async def scenario():
+        for goal_id in ("g1", "g2"):
+            contributions = _entries(60, OLD, ["deposit"])
+            await db["goals"].insert_one({"_id": goal_id, "userId": "u1", "completed": True, "currentValue": compaction.ledger_balance(contributions), "contributions": contributions})
+
+        original = compaction.compact_document
+
+        async def flaky(collection, owner_type, doc, cutoff):
+            if doc["_id"] == "g1":
+                raise RuntimeError("WriteConflict")
+            return await original(collection, owner_type, doc, cutoff)
+
+        monkeypatch.setattr(compaction, "compact_document", flaky)
+        stats = await compaction.run_compaction()
+
+        assert stats["goals"] == {"compacted": 1, "failed": 1}
+        assert len((await db["goals"].find_one({"_id": "g1"}))["contributions"]) == 60
+
+    asyncio.run(scenario())
+
+
+def test_deleting_an_owner_drops_its_archive(db):
+    async def scenario():
+        goal_id, bucket_id, kept_id = ObjectId(), ObjectId(), ObjectId()
+        for owner_id in (goal_id, kept_id):
+            contributions = _entries(60, OLD, ["deposit"])
+            await db["goals"].insert_one({"_id": owner_id, "userId": "u1", "completed": True, "currentValue": compaction.ledger_balance(contributions), "contributions": contributions})
+        await db["buckets"].insert_one({"_id": bucket_id, "userId": "u1", "totalBalance": 0, "contributions": _entries(60, OLD, ["withdrawal"])})
+        await compaction.run_compaction()
+        assert await db["ledger_archive"].count_documents({}) == 3
+
+        user = {"sub": "u1"}
+        await crud.deleteGoal(str(goal_id), user=user)
+        await buckets.delete_bucket(str(bucket_id), user=user)
+
+        remaining = await db["ledger_archive"].find({}).to_list(length=10)
+        assert [archive["ownerId"] for archive in remaining] == [str(kept_id)]
+
+    asyncio.run(scenario())
@@ -0,0 +1,77 @@
+# backend/tests/test_jobs.py
+# Every API worker runs a scheduler, so the lease is all that keeps passes from overlapping
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import jobs
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock_motor.AsyncMongoMockClient()["goal_app"]
+    monkeypatch.setattr(jobs, "job_locks_collection", database["job_locks"])
+    monkeypatch.setattr(jobs, "job_reports_collection", database["job_reports"])
+    return database
+
+
+def _scheduler(owner: str) -> jobs.JobScheduler:
+    scheduler = jobs.JobScheduler()
+    scheduler.owner = owner  # two "processes" in one test
+    return scheduler
+
+
+def test_second_claim_fails_while_lease_is_held(db):
+    async def scenario():
+        job = jobs.Job("compaction", 3600, None)
+
+        assert await _scheduler("a").claim(job)
+        assert not await _scheduler("b").claim(job)
+
+        await db["job_locks"].update_one({"_id": "compaction"}, {"$set": {"lockedUntil": datetime.utcnow() - timedelta(seconds=1)}})
+        assert await _scheduler("b").claim(job)
+
+    asyncio.run(scenario())
+
+
+def test_lease_is_renewed_while_a_long_pass_runs(db, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", 0.3)
+
+    async def scenario():
+        calls = []
+
+        async def long_pass():
+            calls.append(1)
+            await asyncio.sleep(1)  # several lease lengths
+            return {}
+
+        job = jobs.Job("reconciliation", 0.1, long_pass)
+        first = asyncio.create_task(_scheduler("a").run_once(job))
+        await asyncio.sleep(0.7)
+
+        assert await _scheduler("b").run_once(job) is None
+        report = await first
+        assert report["status"] == "ok"
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_finished_pass_holds_the_job_for_its_interval(db, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", 0.3)
+
+    async def scenario():
+        async def quick_pass():
+            return {}
+
+        job = jobs.Job("compaction", 3600, quick_pass)
+        report = await _scheduler("a").run_once(job)
+        lock = await db["job_locks"].find_one({"_id": "compaction"})
+
+        assert lock["lockedUntil"] >= report["startedAt"] + timedelta(seconds=3599)
+        assert not await _scheduler("b").claim(job)
+
+    asyncio.run(scenario())
@@ -0,0 +1,158 @@
+# backend/tests/test_rate_limit.py
+# The limiter sits in front of every money-moving route, so these pin down when it says no
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import rate_limit
+import transactions
+from auth import get_current_user
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    clock = FakeClock()
+    backend = rate_limit.InMemoryBackend()
+    # Only the limiter's view of time is faked; the event loop keeps the real clock
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate_limit, "backend", backend)
+    return backend, clock
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    collection = mongomock_motor.AsyncMongoMockClient()["goal_app"]["rate_limits"]
+    monkeypatch.setattr(rate_limit, "rate_limits_collection", collection)
+    return rate_limit.MongoBackend(), collection
+
+
+def _tx_app(monkeypatch, handler):
+    monkeypatch.setattr(transactions, "TX_BURST", 10)
+    monkeypatch.setattr(transactions, "TX_MAX_IN_FLIGHT", 1)
+    app = FastAPI()
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "u1"}
+    app.add_api_route("/tx", handler, methods=["POST"], dependencies=[Depends(transactions.limit_transactions)])
+    return TestClient(app)
+
+
+def test_burst_then_429_with_retry_after(memory):
+    async def scenario():
+        for _ in range(3):
+            await rate_limit.check_rate("k", 3, 0.5)
+        with pytest.raises(HTTPException) as refused:
+            await rate_limit.check_rate("k", 3, 0.5)
+
+        assert refused.value.status_code == 429
+        # One token at 0.5/s is two seconds away
+        assert refused.value.headers["Retry-After"] == "2"
+
+    asyncio.run(scenario())
+
+
+def test_tokens_refill_over_time(memory):
+    backend, clock = memory
+
+    async def scenario():
+        assert await backend.take("k", 2, 1.0) == 0
+        assert await backend.take("k", 2, 1.0) == 0
+        assert await backend.take("k", 2, 1.0) == pytest.approx(1.0)
+
+        clock.now += 1.0
+        assert await backend.take("k", 2, 1.0) == 0
+        assert await backend.take("k", 2, 1.0) > 0
+
+        # Refill stops at the burst size however long the key sits idle
+        clock.now += 60
+        assert await backend.take("k", 2, 1.0) == 0
+        assert await backend.take("k", 2, 1.0) == 0
+        assert await backend.take("k", 2, 1.0) > 0
+
+    asyncio.run(scenario())
+
+
+def test_idle_buckets_are_pruned(memory, monkeypatch):
+    backend, clock = memory
+    monkeypatch.setattr(rate_limit.InMemoryBackend, "MAX_KEYS", 2)
+
+    async def scenario():
+        await backend.take("idle", 2, 1.0)
+        clock.now += 10  # long enough for "idle" to refill completely
+        await backend.take("a", 2, 1.0)
+        await backend.take("b", 2, 1.0)
+
+        assert set(backend.buckets) == {"a", "b"}
+
+    asyncio.run(scenario())
+
+
+def test_slot_released_when_handler_raises(memory, monkeypatch):
+    backend, _ = memory
+
+    async def handler():
+        raise HTTPException(status_code=400, detail="Insufficient funds")
+
+    client = _tx_app(monkeypatch, handler)
+
+    # With one slot, a leaked slot would turn the second request into a 429
+    assert client.post("/tx").status_code == 400
+    assert client.post("/tx").status_code == 400
+    assert backend.in_flight == {}
+
+
+def test_refused_slot_does_not_spend_a_token(memory, monkeypatch):
+    backend, _ = memory
+
+    async def handler():
+        return {"ok": True}
+
+    client = _tx_app(monkeypatch, handler)
+    asyncio.run(backend.acquire("tx:u1", 1))  # a request already in flight
+
+    response = client.post("/tx")
+
+    assert response.status_code == 429
+    assert "tx:u1" not in backend.buckets
+
+
+def test_mongo_take_is_a_token_bucket(mongo):
+    backend, collection = mongo
+
+    async def scenario():
+        assert await backend.take("k", 2, 1.0) == 0
+        assert await backend.take("k", 2, 1.0) == 0
+        assert await backend.take("k", 2, 1.0) > 0
+
+        doc = await collection.find_one({"_id": "bucket:k"})
+        assert doc["tokens"] < 1
+        assert "expiresAt" in doc
+
+    asyncio.run(scenario())
+
+
+def test_mongo_acquire_refuses_at_limit(mongo):
+    backend, collection = mongo
+
+    async def scenario():
+        assert await backend.acquire("k", 2)
+        assert await backend.acquire("k", 2)
+        # At the limit the filter misses and the upsert collides with the existing _id
+        assert not await backend.acquire("k", 2)
+
+        await backend.release("k")
+        assert await backend.acquire("k", 2)
+        assert (await collection.find_one({"_id": "slots:k"}))["count"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,112 @@
+# backend/tests/test_reconciliation.py
+# The scan only reports, so these check that it reports the right things and nothing else
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import reconciliation
+
+OLD = datetime(2020, 1, 1)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock_motor.AsyncMongoMockClient()["goal_app"]
+
+    # mongomock's with_options hands back a synchronous collection, so read straight through
+    async def scan(collection, projection):
+        async for doc in collection.find({}, projection):
+            yield doc
+
+    monkeypatch.setattr(reconciliation, "goals_collection", database["goals"])
+    monkeypatch.setattr(reconciliation, "buckets_collection", database["buckets"])
+    monkeypatch.setattr(reconciliation, "_scan", scan)
+    return database
+
+
+def _leg(kind: str, counterpart, amount: int, timestamp: datetime) -> dict:
+    return {"id": str(ObjectId()), "amount": amount, "type": kind, "referenceId": str(counterpart), "timestamp": timestamp}
+
+
+async def _insert_goal(db, goal_id, contributions: list):
+    await db["goals"].insert_one({
+        "_id": goal_id,
+        "currentValue": reconciliation.ledger_balance(contributions),
+        "contributions": contributions,
+    })
+
+
+def test_paired_transfer_is_clean(db):
+    async def scenario():
+        source, target = ObjectId(), ObjectId()
+        deposit = {"id": "d1", "amount": 100, "type": "deposit", "timestamp": OLD}
+        await _insert_goal(db, source, [deposit, _leg("transfer_out", target, 40, OLD + timedelta(days=1))])
+        await _insert_goal(db, target, [_leg("transfer_in", source, 40, OLD + timedelta(days=1))])
+
+        report = await reconciliation.run_reconciliation()
+
+        assert report["findingCounts"] == {}
+        assert report["scanned"]["transfers"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_unmatched_transfer_is_reported(db):
+    async def scenario():
+        source, target = ObjectId(), ObjectId()
+        await _insert_goal(db, source, [_leg("transfer_out", target, 40, OLD)])
+        await _insert_goal(db, target, [])
+
+        report = await reconciliation.run_reconciliation()
+
+        assert report["findingCounts"] == {"unmatched_transfer": 1}
+        assert report["findings"][0]["missing"] == "transfer_in"
+
+    asyncio.run(scenario())
+
+
+def test_twin_folded_into_a_checkpoint_is_not_reported(db):
+    async def scenario():
+        source, target = ObjectId(), ObjectId()
+        await _insert_goal(db, source, [_leg("transfer_out", target, 40, OLD)])
+        # Compaction folded the transfer_in into the target's checkpoint
+        checkpoint = {"id": "cp", "amount": 40, "type": "checkpoint", "timestamp": OLD + timedelta(days=1)}
+        await _insert_goal(db, target, [checkpoint])
+
+        report = await reconciliation.run_reconciliation()
+
+        assert report["findingCounts"] == {}
+
+    asyncio.run(scenario())
+
+
+def test_leg_of_a_deleted_goal_is_orphaned_not_unmatched(db):
+    async def scenario():
+        target, deleted = ObjectId(), ObjectId()
+        await _insert_goal(db, target, [_leg("transfer_in", deleted, 40, OLD)])
+
+        report = await reconciliation.run_reconciliation()
+
+        assert report["findingCounts"] == {"orphaned_transfer": 1}
+        assert report["findings"][0]["sourceId"] == str(deleted)
+
+    asyncio.run(scenario())
+
+
+def test_recent_legs_wait_for_the_next_pass(db):
+    async def scenario():
+        # Only one leg read so far, as when a transfer commits between reading the two goals
+        source, target = ObjectId(), ObjectId()
+        await _insert_goal(db, source, [_leg("transfer_out", target, 40, datetime.utcnow())])
+        await _insert_goal(db, target, [])
+
+        report = await reconciliation.run_reconciliation()
+
+        assert report["findingCounts"] == {}
+        assert report["scanned"]["unsettledTransferLegs"] == 1
+
+    asyncio.run(scenario())
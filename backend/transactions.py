@@ -6,8 +6,22 @@ from bson import ObjectId
 from datetime import datetime
 import uuid
 from crud import goalHelper  # NEW - Import our formatting helper
+from json_response import FastJSONResponse
+from etags import bump_data_version
+from rate_limit import TX_BURST, TX_MAX_IN_FLIGHT, TX_REFILL_PER_SEC, check_rate, in_flight_slot
+from schemas import GoalResponse
 
-router = APIRouter(prefix="/transactions", tags=["transactions"])
+
+# NEW - Every transactional route is rate limited and capped on concurrent Mongo sessions per user
+async def limit_transactions(user=Depends(get_current_user)):
+    key = f"tx:{user['sub']}"
+    # Slot first: a request refused by the in-flight cap must not also spend a token
+    async with in_flight_slot(key, TX_MAX_IN_FLIGHT):
+        await check_rate(key, TX_BURST, TX_REFILL_PER_SEC)
+        yield
+
+
+router = APIRouter(prefix="/transactions", tags=["transactions"], dependencies=[Depends(limit_transactions)])
 
 async def get_unallocated_balance(bucket_id: str, user_id: str, session=None) -> int:
     """Helper to dynamically calculate unallocated funds during a transaction."""
@@ -24,7 +38,7 @@ async def get_unallocated_balance(bucket_id: str, user_id: str, session=None) ->
 
 
 # --- 1. GOAL ALLOCATIONS (With Unallocated Check) ---
-@router.post("/goal/{id}/contribute")
+@router.post("/goal/{id}/contribute", response_model=GoalResponse)
 async def allocate_to_goal(
     id: str, 
     payload: dict, 
@@ -72,7 +86,10 @@ async def allocate_to_goal(
             
             # CHANGED - Wrap the raw MongoDB document in goalHelper before returning
             updated_goal = await goals_collection.find_one({"_id": ObjectId(id)}, session=session)
-            return goalHelper(updated_goal)
+
+    # Only invalidate cached lists once the transaction has committed
+    await bump_data_version(user["sub"])
+    return FastJSONResponse(goalHelper(updated_goal))
 
 
 # --- 2. BUCKET WITHDRAWALS (With Unallocated Check) ---
@@ -102,7 +119,9 @@ async def withdraw_from_bucket(id: str, payload: dict, user=Depends(get_current_
                 {"$inc": {"totalBalance": -amount}, "$push": {"contributions": contribution_record}},
                 session=session
             )
-            return {"message": "Withdrawal successful"}
+
+    await bump_data_version(user["sub"])
+    return {"message": "Withdrawal successful"}
 
 
 # --- 3. THE SMART TRANSFER (Double-Entry & Overflow Protection) ---
@@ -114,8 +133,13 @@ async def transfer_between_goals(payload: dict, user=Depends(get_current_user)):
 
     async with await client.start_session() as session:
         async with session.start_transaction():
-            source = await goals_collection.find_one({"_id": ObjectId(source_id), "userId": user["sub"]}, session=session)
-            target = await goals_collection.find_one({"_id": ObjectId(target_id), "userId": user["sub"]}, session=session)
+            # CHANGED: A session can't run operations concurrently, so fetch both goals in a single query instead
+            goals = await goals_collection.find(
+                {"_id": {"$in": [ObjectId(source_id), ObjectId(target_id)]}, "userId": user["sub"]}, session=session
+            ).to_list(length=2)
+            goals_by_id = {str(goal["_id"]): goal for goal in goals}
+            source = goals_by_id.get(source_id)
+            target = goals_by_id.get(target_id)
 
             if not source or not target:
                 raise HTTPException(status_code=404, detail="Source or target goal not found.")
@@ -153,9 +177,10 @@ async def transfer_between_goals(payload: dict, user=Depends(get_current_user)):
                 session=session
             )
 
-            return {
-                "message": "Transfer complete.",
-                "requested": requested_amount,
-                "transferred": actual_transfer,
-                "overflow_prevented": requested_amount - actual_transfer
-            }
\ No newline at end of file
+    await bump_data_version(user["sub"])
+    return {
+        "message": "Transfer complete.",
+        "requested": requested_amount,
+        "transferred": actual_transfer,
+        "overflow_prevented": requested_amount - actual_transfer
+    }
\ No newline at end of file
@@ -0,0 +1,20 @@
+# backend/worker.py
+# NEW - Standalone entry point for the maintenance jobs
+# Run with `python worker.py` and set RUN_BACKGROUND_JOBS=false on the API containers.
+import asyncio
+from database import create_indexes
+from jobs import build_scheduler
+
+
+async def main():
+    await create_indexes()
+    scheduler = build_scheduler()
+    scheduler.start()
+    try:
+        await asyncio.gather(*scheduler.tasks)
+    finally:
+        await scheduler.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
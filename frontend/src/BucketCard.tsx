@@ -66,6 +66,7 @@ export function BucketCard({ bucket }: BucketCardProps) {
   const refreshData = () => {
     queryClient.invalidateQueries({ queryKey: ["buckets"] });
     queryClient.invalidateQueries({ queryKey: ["goals"] });
+    queryClient.invalidateQueries({ queryKey: ["dashboard"] });
   };
 
   const updateMutation = useMutation({
@@ -3,12 +3,7 @@
 // frontend/src/Dashboard.tsx
 import { useEffect, useState, useMemo } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import {
-  getGoals,
-  getBuckets,
-  getCurrentUser,
-  createBucket,
-} from "./api/goals";
+import { getDashboard, createBucket } from "./api/goals";
 import type { Goal, Bucket } from "./api/goals"; // CHANGED: Ensure User is exported from api/goals
 import { GoalForm } from "./GoalForm";
 import { BucketCard } from "./BucketCard";
@@ -45,7 +40,6 @@ export function Dashboard() {
   const navigate = useNavigate();
 
   // STATES
-  const [user, setUser] = useState<any>(null); // NEW: User State for Header
   const [filteredGoals, setFilteredGoals] = useState<Goal[]>([]);
   const [searchTerm, setSearchTerm] = useState("");
   const [selectedCategory, setSelectedCategory] = useState<string>("all");
@@ -60,34 +54,29 @@ export function Dashboard() {
     totalBalance: 0,
   });
 
-  useEffect(() => {
-    const verifyUser = async () => {
-      try {
-        const res = await getCurrentUser();
-        setUser(res.data); // CHANGED: Saving user data
-      } catch (error) {
-        navigate("/");
-      }
-    };
-    verifyUser();
-  }, [navigate]);
-
-  const { data: goalsResponse, isLoading: goalsLoading } = useQuery({
-    queryKey: ["goals"],
-    queryFn: getGoals,
-  });
-  const { data: bucketsResponse, isLoading: bucketsLoading } = useQuery({
-    queryKey: ["buckets"],
-    queryFn: getBuckets,
+  // CHANGED: User, buckets and goals now arrive in a single /dashboard request
+  const {
+    data: dashboardResponse,
+    isLoading: dashboardLoading,
+    isError: dashboardError,
+  } = useQuery({
+    queryKey: ["dashboard"],
+    queryFn: getDashboard,
   });
 
-  const goals = goalsResponse?.data || EMPTY_GOALS;
-  const buckets = bucketsResponse?.data || EMPTY_BUCKETS;
+  useEffect(() => {
+    if (dashboardError) navigate("/");
+  }, [dashboardError, navigate]);
+
+  const user = dashboardResponse?.data.user ?? null;
+  const goals = dashboardResponse?.data.goals || EMPTY_GOALS;
+  const buckets = dashboardResponse?.data.buckets || EMPTY_BUCKETS;
 
   const createBucketMutation = useMutation({
     mutationFn: (bucket: Partial<Bucket>) => createBucket(bucket),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["buckets"] });
+      queryClient.invalidateQueries({ queryKey: ["dashboard"] });
       setShowBucketForm(false);
       setNewBucket({ name: "", type: "bank_account", totalBalance: 0 });
       toast.success("Bucket created successfully!");
@@ -152,7 +141,7 @@ export function Dashboard() {
 
   const categories = [...new Set(goals.map((g) => g.category).filter(Boolean))];
 
-  if (goalsLoading || bucketsLoading) {
+  if (dashboardLoading) {
     return (
       <div className="min-h-screen flex items-center justify-center bg-[#F1F0E8]">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-[#89A8B2]" />
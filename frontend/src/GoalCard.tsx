@@ -3,8 +3,8 @@
 "use client";
 
 import { useState } from "react";
-import { useMutation, useQueryClient } from "@tanstack/react-query";
-import { deleteGoal, completeGoal, allocateToGoal } from "./api/goals";
+import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import { deleteGoal, completeGoal, allocateToGoal, getGoal } from "./api/goals";
 import type { Goal } from "./api/goals";
 import { Input } from "@/components/ui/input";
 import {
@@ -61,6 +61,13 @@ export function GoalCard({ goal, onGoalUpdated }: GoalCardProps) {
   const [chartDialogOpen, setChartDialogOpen] = useState(false);
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false); // NEW: Manual state
 
+  // NEW: The dashboard only carries summaries, so the ledger is fetched when the chart opens
+  const { data: ledgerResponse, isLoading: ledgerLoading } = useQuery({
+    queryKey: ["goals", goal.id],
+    queryFn: () => getGoal(goal.id!),
+    enabled: chartDialogOpen && !!goal.id,
+  });
+
   const progress = Math.min((goal.currentValue / goal.targetValue) * 100, 100);
   const isCompleted = goal.currentValue >= goal.targetValue;
   const isOfficiallyCompleted = goal.completed;
@@ -69,6 +76,7 @@ export function GoalCard({ goal, onGoalUpdated }: GoalCardProps) {
   const onSuccessRefresh = () => {
     queryClient.invalidateQueries({ queryKey: ["goals"] });
     queryClient.invalidateQueries({ queryKey: ["buckets"] });
+    queryClient.invalidateQueries({ queryKey: ["dashboard"] });
     onGoalUpdated();
   };
 
@@ -134,7 +142,13 @@ export function GoalCard({ goal, onGoalUpdated }: GoalCardProps) {
               {goal.name} Progress
             </DialogTitle>
           </DialogHeader>
-          <GoalChart goal={goal} />
+          {ledgerLoading ? (
+            <div className="flex items-center justify-center h-64">
+              <div className="animate-spin rounded-full h-10 w-10 border-b-2 border-[#89A8B2]" />
+            </div>
+          ) : (
+            <GoalChart goal={ledgerResponse?.data ?? goal} />
+          )}
         </DialogContent>
       </Dialog>
 
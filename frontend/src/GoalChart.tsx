@@ -34,6 +34,9 @@ export function GoalChart({ goal }: GoalChartProps) {
         runningBalance += entry.amount;
       } else if (entry.type === "withdrawal") {
         runningBalance -= entry.amount;
+      } else if (entry.type === "checkpoint") {
+        // Older history was compacted into this balance on the backend
+        runningBalance = entry.amount;
       }
 
       const dateObj = entry.timestamp ? new Date(entry.timestamp) : new Date();
@@ -87,7 +90,12 @@ export function GoalChart({ goal }: GoalChartProps) {
           >
             ₹{data.balance.toLocaleString("en-IN")}
           </p>
-          {data.type !== "start" && (
+          {data.type === "checkpoint" && (
+            <p className="text-sm font-bold mt-1 text-[#546e7a]">
+              Balance carried forward
+            </p>
+          )}
+          {data.type !== "start" && data.type !== "checkpoint" && (
             <p
               className={`text-sm font-bold mt-1 ${data.type === "deposit" ? "text-green-600" : "text-[#BF4646]"}`}
             >
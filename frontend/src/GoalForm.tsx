@@ -137,6 +137,7 @@ export function GoalForm({
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["goals"] });
       queryClient.invalidateQueries({ queryKey: ["buckets"] });
+      queryClient.invalidateQueries({ queryKey: ["dashboard"] });
       onGoalCreated();
       toast.success("🎉 Goal created successfully!");
     },
@@ -148,6 +149,7 @@ export function GoalForm({
       updateGoal(initialData!.id!, updatedGoal),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["goals"] });
+      queryClient.invalidateQueries({ queryKey: ["dashboard"] });
       onGoalCreated();
       toast.success("✨ Goal updated successfully!");
     },
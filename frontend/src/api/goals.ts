@@ -6,7 +6,7 @@ import axios from "axios";
 export interface Contribution {
   id?: string;
   amount: number;
-  type: "deposit" | "withdrawal" | "transfer_in" | "transfer_out";
+  type: "deposit" | "withdrawal" | "transfer_in" | "transfer_out" | "checkpoint"; // checkpoint = compacted balance
   referenceId?: string; // Used for linking transfers
   timestamp?: string;
 }
@@ -34,6 +34,13 @@ export interface Goal {
   contributions?: Contribution[];
 }
 
+// NEW - Combined payload from GET /dashboard/ (goals come without their contributions)
+export interface DashboardData {
+  user: { id: string; email: string; name?: string };
+  buckets: Bucket[];
+  goals: Goal[];
+}
+
 // --- API CONFIG ---
 
 const API_BASE_URL =
@@ -61,6 +68,7 @@ export const logout = () => api.post(`/auth/logout`, {});
 
 // --- GOALS ---
 export const getGoals = () => api.get<Goal[]>("/goals/");
+export const getGoal = (id: string) => api.get<Goal>(`/goals/${id}`); // NEW - Full goal, ledger included
 export const createGoal = (goal: Partial<Goal>) =>
   api.post<Goal>("/goals/", goal);
 export const updateGoal = (id: string, goal: Partial<Goal>) =>
@@ -70,6 +78,10 @@ export const deleteGoal = (id: string) =>
 export const completeGoal = (id: string) =>
   api.put<Goal>(`/goals/${id}/complete`);
 
+// --- DASHBOARD (NEW) ---
+// One round trip for the user, buckets and goal summaries
+export const getDashboard = () => api.get<DashboardData>("/dashboard/");
+
 // --- BUCKETS (NEW) ---
 export const getBuckets = () => api.get<Bucket[]>("/buckets/");
 export const createBucket = (bucket: Partial<Bucket>) =>